@@ -7,9 +7,12 @@ from datetime import date, datetime, timedelta
 from tkinter import messagebox, ttk
 from typing import List
 
-from correlheatmap.analysis import CorrelationResult, compute_correlation_matrix
-from correlheatmap.data import fetch_daily_closes
-from correlheatmap.visualization import correlation_to_hex
+import numpy as np
+from PIL import Image, ImageTk
+
+from correlheatmap.analysis import CorrelationResult
+from correlheatmap.pipeline import PriceDownloadError, correlate_tickers
+from correlheatmap.visualization import correlations_to_rgb
 
 DEFAULT_LOOKBACK_DAYS = 365
 CELL_SIZE = 70
@@ -70,6 +73,8 @@ class HeatmapApp:
         self.table = ttk.Treeview(results, show="headings", height=5)
         self.table.pack(side=tk.TOP, fill=tk.X, pady=10)
 
+        self._heatmap_image: ImageTk.PhotoImage | None = None
+
         self.status_var = tk.StringVar(value="Enter tickers and click 'Build heatmap'.")
         ttk.Label(results, textvariable=self.status_var).pack(side=tk.TOP, anchor=tk.W)
 
@@ -88,13 +93,12 @@ class HeatmapApp:
             return
 
         try:
-            price_history = fetch_daily_closes(tickers, start=start_date, end=end_date)
-        except Exception as exc:
+            result = correlate_tickers(
+                tickers, start=start_date, end=end_date, return_type=self.return_var.get()
+            )
+        except PriceDownloadError as exc:
             messagebox.showerror("Data error", f"Unable to download prices: {exc}")
             return
-
-        try:
-            result = compute_correlation_matrix(price_history, return_type=self.return_var.get())
         except ValueError as exc:
             messagebox.showerror("Analysis error", str(exc))
             return
@@ -102,10 +106,13 @@ class HeatmapApp:
         self.status_var.set(
             f"Computed correlations using {result.observation_count} overlapping daily returns."
         )
-        self._render_heatmap(result)
-        self._render_table(result)
+        # Format every value once and share the strings between the heatmap overlay
+        # and the table.
+        labels = np.char.mod("%.2f", np.asarray(result.matrix)).tolist()
+        self._render_heatmap(result, labels)
+        self._render_table(result, labels)
 
-    def _render_heatmap(self, result: CorrelationResult) -> None:
+    def _render_heatmap(self, result: CorrelationResult, labels: List[List[str]]) -> None:
         tickers = result.tickers
         size = CELL_SIZE
         offset = LABEL_OFFSET
@@ -120,24 +127,26 @@ class HeatmapApp:
             self.canvas.create_text(x, y, text=ticker, angle=90, font=FONT)
             self.canvas.create_text(offset / 2, offset + idx * size + size / 2, text=ticker, font=FONT)
 
-        for row_idx, row in enumerate(result.matrix):
-            for col_idx, value in enumerate(row):
-                x0 = offset + col_idx * size
-                y0 = offset + row_idx * size
-                x1 = x0 + size
-                y1 = y0 + size
-                colour = correlation_to_hex(value)
-                self.canvas.create_rectangle(x0, y0, x1, y1, fill=colour, outline="white")
+        # Paint every cell into one RGB buffer and hand Tk a single image; only the
+        # numeric overlays remain as individual canvas items.
+        cells = correlations_to_rgb(np.asarray(result.matrix)).repeat(size, axis=0).repeat(size, axis=1)
+        cells[size - 1 :: size, :] = 255
+        cells[:, size - 1 :: size] = 255
+        self._heatmap_image = ImageTk.PhotoImage(Image.fromarray(cells))
+        self.canvas.create_image(offset, offset, anchor=tk.NW, image=self._heatmap_image)
+
+        for row_idx, row in enumerate(labels):
+            for col_idx, label in enumerate(row):
                 self.canvas.create_text(
-                    (x0 + x1) / 2,
-                    (y0 + y1) / 2,
-                    text=f"{value:.2f}",
+                    offset + col_idx * size + size / 2,
+                    offset + row_idx * size + size / 2,
+                    text=label,
                     font=FONT,
                 )
 
-    def _render_table(self, result: CorrelationResult) -> None:
+    def _render_table(self, result: CorrelationResult, labels: List[List[str]]) -> None:
         tickers = result.tickers
-        columns = ["Ticker"] + tickers
+        columns = ["Ticker", *tickers]
         self.table.configure(columns=columns)
         for column in columns:
             anchor = "w" if column == "Ticker" else "center"
@@ -148,9 +157,8 @@ class HeatmapApp:
         for row in self.table.get_children():
             self.table.delete(row)
 
-        for ticker, values in zip(tickers, result.matrix):
-            formatted = [f"{value:.2f}" for value in values]
-            self.table.insert("", tk.END, values=[ticker] + formatted)
+        for ticker, row in zip(tickers, labels):
+            self.table.insert("", tk.END, values=[ticker, *row])
 
     @staticmethod
     def _parse_tickers(raw: str) -> List[str]:
@@ -1,15 +1,19 @@
 """Correlation heatmap tools."""
 
 from .analysis import CorrelationResult, compute_correlation_matrix, compute_returns
-from .data import PriceHistory, PricePoint, fetch_daily_closes
-from .visualization import correlation_to_hex
+from .data import PriceHistory, PriceSeries, fetch_daily_closes
+from .pipeline import PriceDownloadError, correlate_tickers
+from .visualization import correlation_to_hex, correlations_to_rgb
 
 __all__ = [
     "CorrelationResult",
+    "PriceDownloadError",
     "PriceHistory",
-    "PricePoint",
+    "PriceSeries",
     "compute_correlation_matrix",
     "compute_returns",
+    "correlate_tickers",
     "fetch_daily_closes",
     "correlation_to_hex",
+    "correlations_to_rgb",
 ]
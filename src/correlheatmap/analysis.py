@@ -1,75 +1,113 @@
-"""Pure-Python correlation calculations for price history data."""
+"""Return and correlation calculations for price history data."""
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date
-from math import isclose, log, sqrt
-from statistics import mean
-from typing import Dict, List, Sequence, Tuple
+from functools import partial, reduce
+from typing import List, Tuple
 
-from .data import PriceHistory, PricePoint
+import numpy as np
 
-ReturnPoint = Tuple[date, float]
+try:
+    import numexpr  # type: ignore
+except ImportError:  # pragma: no cover - exercised only when numexpr is missing
+    numexpr = None
 
+from .analysis_numba import cross_product
+from .data import PriceHistory, PriceSeries
 
-@dataclass
+# Below this many returns numexpr's thread pool costs more than it saves.
+NUMEXPR_MIN_OBSERVATIONS = 50_000
+
+# Below this many prices across all tickers, thread start-up outweighs computing
+# each ticker's returns serially.
+THREADED_MIN_OBSERVATIONS = 250_000
+
+# Parallel arrays of observation dates (``datetime64[D]``) and float64 returns.
+ReturnSeries = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass(frozen=True)
 class CorrelationResult:
-    tickers: List[str]
-    matrix: List[List[float]]
+    # Immutable so cached results can be shared safely between callers.
+    tickers: Tuple[str, ...]
+    matrix: Tuple[Tuple[float, ...], ...]
     observation_count: int
 
 
-def compute_returns(series: Sequence[PricePoint], *, return_type: str = "log") -> List[ReturnPoint]:
-    """Compute daily returns from a time-ordered price series."""
+def compute_returns(series: PriceSeries, *, return_type: str = "log") -> ReturnSeries:
+    """Compute daily returns from a ``(dates, closes)`` price series."""
+
+    dates = np.asarray(series[0], dtype="datetime64[D]")
+    prices = np.asarray(series[1], dtype=np.float64)
+    if len(dates) != len(prices):
+        raise ValueError("Price dates and closes must have the same length.")
 
-    if len(series) < 2:
+    if len(prices) < 2:
         raise ValueError("At least two price observations are required to compute returns.")
 
     if return_type not in {"log", "pct"}:
         raise ValueError("Return type must be 'log' or 'pct'.")
 
-    ordered = sorted(series, key=lambda item: item[0])
-    returns: List[ReturnPoint] = []
-
-    previous_date, previous_price = ordered[0]
-    for current_date, current_price in ordered[1:]:
-        if previous_price <= 0 or current_price <= 0:
-            previous_date, previous_price = current_date, current_price
-            continue
-        if return_type == "log":
-            value = log(current_price / previous_price)
-        else:
-            value = (current_price - previous_price) / previous_price
-        returns.append((current_date, value))
-        previous_date, previous_price = current_date, current_price
-
-    if not returns:
+    # fetch_daily_closes already yields chronological, one-close-per-day data, so
+    # only pay for a sort or de-duplication when a caller hands in something else.
+    gaps = np.diff(dates)
+    if (gaps < np.timedelta64(0, "D")).any():
+        order = np.argsort(dates, kind="stable")
+        dates, prices = dates[order], prices[order]
+        gaps = np.diff(dates)
+    if not gaps.all():
+        # Keep the last close reported for each date so return dates are unique.
+        keep = np.append(gaps != np.timedelta64(0, "D"), True)
+        dates, prices = dates[keep], prices[keep]
+
+    valid = (prices[:-1] > 0) & (prices[1:] > 0)
+    previous, current = prices[:-1][valid], prices[1:][valid]
+    expression = "log(current / previous)" if return_type == "log" else "(current - previous) / previous"
+    if numexpr is not None and len(current) >= NUMEXPR_MIN_OBSERVATIONS:
+        values = numexpr.evaluate(expression, local_dict={"current": current, "previous": previous})
+    elif return_type == "log":
+        values = np.log(current / previous)
+    else:
+        values = (current - previous) / previous
+
+    if not len(values):
         raise ValueError("Unable to compute returns due to non-positive prices or insufficient data.")
-    return returns
+    return dates[1:][valid], values
 
 
 def _align_returns(
     price_history: PriceHistory, *, return_type: str = "log"
-) -> Tuple[List[str], List[List[float]]]:
-    ticker_returns: Dict[str, Dict[date, float]] = {}
-    for ticker, series in price_history.items():
-        returns = compute_returns(series, return_type=return_type)
-        ticker_returns[ticker] = {obs_date: value for obs_date, value in returns}
-
-    tickers = sorted(ticker_returns.keys())
+) -> Tuple[List[str], np.ndarray]:
+    tickers = sorted(price_history.keys())
     if len(tickers) < 2:
         raise ValueError("At least two tickers are required to compute correlations.")
 
-    common_dates = set.intersection(*(set(values.keys()) for values in ticker_returns.values()))
+    worker = partial(compute_returns, return_type=return_type)
+    series = [price_history[ticker] for ticker in tickers]
+    workers = min(len(tickers), os.cpu_count() or 1)
+    if workers > 1 and sum(len(closes) for _, closes in series) >= THREADED_MIN_OBSERVATIONS:
+        # NumPy releases the GIL inside the array kernels, so independent tickers
+        # can make progress on separate threads.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            ticker_returns = list(executor.map(worker, series))
+    else:
+        ticker_returns = [worker(closes) for closes in series]
+
+    # Return dates come out of compute_returns sorted and unique, so the
+    # intersection can skip re-uniquing each array and searchsorted finds each
+    # common date's row per ticker.
+    common_dates = reduce(
+        partial(np.intersect1d, assume_unique=True), (dates for dates, _ in ticker_returns)
+    )
     if len(common_dates) < 2:
         raise ValueError("Not enough overlapping return observations across tickers.")
 
-    sorted_dates = sorted(common_dates)
-    matrix: List[List[float]] = []
-    for obs_date in sorted_dates:
-        row = [ticker_returns[ticker][obs_date] for ticker in tickers]
-        matrix.append(row)
+    matrix = np.empty((len(common_dates), len(tickers)), dtype=np.float64)
+    for column, (dates, values) in enumerate(ticker_returns):
+        matrix[:, column] = values[np.searchsorted(dates, common_dates)]
 
     return tickers, matrix
 
@@ -86,34 +124,25 @@ def compute_correlation_matrix(
     if n_observations < 2:
         raise ValueError("Not enough return observations to compute correlation.")
 
-    columns = list(zip(*matrix))
-    means = [mean(column) for column in columns]
-    stdevs = [
-        sqrt(sum((value - column_mean) ** 2 for value in column) / (n_observations - 1))
-        for column, column_mean in zip(columns, means)
-    ]
-
-    correlation_matrix: List[List[float]] = []
-    for i in range(len(tickers)):
-        row: List[float] = []
-        for j in range(len(tickers)):
-            if i == j:
-                row.append(1.0)
-                continue
-
-            std_i, std_j = stdevs[i], stdevs[j]
-            if isclose(std_i, 0.0) or isclose(std_j, 0.0):
-                row.append(0.0)
-                continue
-
-            covariance = sum(
-                (matrix[k][i] - means[i]) * (matrix[k][j] - means[j]) for k in range(n_observations)
-            ) / (n_observations - 1)
-            correlation = covariance / (std_i * std_j)
-            row.append(max(-1.0, min(1.0, correlation)))
-        correlation_matrix.append(row)
-
-    return CorrelationResult(tickers=tickers, matrix=correlation_matrix, observation_count=n_observations)
-
-
-__all__ = ["CorrelationResult", "compute_returns", "compute_correlation_matrix"]
+    # Centre each column exactly once, in place, then form every pairwise cross
+    # product in one pass (BLAS, or the Numba kernel when it is installed). The
+    # diagonal of that product holds each column's sum of squares, so
+    # corr_ij = dot_ij / sqrt(sumsq_i * sumsq_j) needs no separate
+    # standard-deviation pass and the (T - 1) factors cancel.
+    matrix -= matrix.mean(axis=0)
+    cross = cross_product(matrix)
+    sumsq = np.diag(cross)
+
+    denominator = np.sqrt(np.outer(sumsq, sumsq))
+    degenerate = denominator == 0.0
+    correlation = np.where(degenerate, 0.0, cross / np.where(degenerate, 1.0, denominator))
+    np.fill_diagonal(correlation, 1.0)
+    np.clip(correlation, -1.0, 1.0, out=correlation)
+    correlation_matrix = tuple(tuple(row) for row in correlation.tolist())
+
+    return CorrelationResult(
+        tickers=tuple(tickers), matrix=correlation_matrix, observation_count=n_observations
+    )
+
+
+__all__ = ["CorrelationResult", "ReturnSeries", "compute_returns", "compute_correlation_matrix"]
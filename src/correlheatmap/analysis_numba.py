@@ -0,0 +1,45 @@
+"""Optional Numba kernel for the correlation cross product."""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import get_num_threads, njit, prange  # type: ignore
+except ImportError:  # pragma: no cover - exercised only when numba is missing
+    NUMBA_AVAILABLE = False
+else:
+    NUMBA_AVAILABLE = True
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _cross_product_kernel(columns):  # type: ignore[no-untyped-def]
+        # Explicit loops rather than np.dot/np.cov: only the upper triangle is
+        # computed and mirrored, and each (i, j) pair runs on its own thread.
+        # ``columns`` is (tickers, observations) so the reduction over k reads
+        # contiguous memory and can be vectorised.
+        n_columns, n_observations = columns.shape
+        out = np.empty((n_columns, n_columns), dtype=np.float64)
+        for i in prange(n_columns):
+            for j in range(i, n_columns):
+                total = 0.0
+                for k in range(n_observations):
+                    total += columns[i, k] * columns[j, k]
+                out[i, j] = total
+                out[j, i] = total
+        return out
+
+
+# Below this many tickers BLAS wins outright, and the kernel would also cost a JIT
+# compile on first use plus thread start-up on every call.
+NUMBA_MIN_TICKERS = 32
+
+
+def cross_product(centred: np.ndarray) -> np.ndarray:
+    """Return ``centred.T @ centred``, using the JIT kernel for wide matrices on multi-core hosts."""
+
+    if not NUMBA_AVAILABLE or centred.shape[1] < NUMBA_MIN_TICKERS or get_num_threads() < 2:
+        return centred.T @ centred
+    return _cross_product_kernel(np.ascontiguousarray(centred.T, dtype=np.float64))
+
+
+__all__ = ["NUMBA_AVAILABLE", "NUMBA_MIN_TICKERS", "cross_product"]
@@ -2,11 +2,47 @@
 
 from __future__ import annotations
 
+import os
+import re
+import time
+from dataclasses import dataclass
 from datetime import date
-from typing import Dict, Iterable, List, Sequence, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
-PricePoint = Tuple[date, float]
-PriceHistory = Dict[str, List[PricePoint]]
+import numpy as np
+
+# Parallel arrays of ascending ``datetime64[D]`` dates and float64 closes.
+PriceSeries = Tuple[np.ndarray, np.ndarray]
+PriceHistory = Dict[str, PriceSeries]
+
+# Overrides the cache location; when unset, CORRELHEATMAP_CACHE_DIR or
+# ~/.cache/correlheatmap is resolved on first use.
+CACHE_DIR: Path | None = None
+CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+_CACHE_FORMAT = "v2"
+_SAFE_SYMBOL = re.compile(r"[A-Z0-9.^=-]+")
+
+
+@dataclass
+class _CachedCloses:
+    """The widest date range downloaded so far for one symbol."""
+
+    start: date | None
+    end: date | None
+    closes: PriceSeries
+    fetched_at: float
+
+    def is_fresh(self) -> bool:
+        return time.time() - self.fetched_at < CACHE_MAX_AGE_SECONDS
+
+    def covers(self, start: date | None, end: date | None) -> bool:
+        starts_early = self.start is None or (start is not None and self.start <= start)
+        ends_late = self.end is None or (end is not None and end <= self.end)
+        return starts_early and ends_late
+
+
+_memory_cache: Dict[str, _CachedCloses] = {}
 
 
 def _normalise_tickers(tickers: Iterable[str]) -> List[str]:
@@ -20,18 +56,96 @@ def _normalise_tickers(tickers: Iterable[str]) -> List[str]:
     return cleaned
 
 
-def fetch_daily_closes(
-    tickers: Sequence[str],
-    *,
-    start: date | None = None,
-    end: date | None = None,
-) -> PriceHistory:
-    """Download daily adjusted closing prices via the optional :mod:`yfinance` dependency."""
+def _cache_dir() -> Path:
+    if CACHE_DIR is not None:
+        return CACHE_DIR
+    configured = os.environ.get("CORRELHEATMAP_CACHE_DIR")
+    return Path(configured) if configured else Path.home() / ".cache" / "correlheatmap"
 
-    normalised = _normalise_tickers(tickers)
-    if not normalised:
-        raise ValueError("At least one ticker symbol must be provided.")
 
+def _cache_path(symbol: str) -> Path | None:
+    # Symbols come straight from user input, so only those that are safe as a
+    # file name get a disk entry. Anything else is cached in memory only.
+    if not _SAFE_SYMBOL.fullmatch(symbol):
+        return None
+    return _cache_dir() / f"{symbol}.{_CACHE_FORMAT}.npz"
+
+
+def _to_day(value: date | None) -> np.datetime64:
+    return np.datetime64("NaT", "D") if value is None else np.datetime64(value, "D")
+
+
+def _from_day(value: np.ndarray) -> date | None:
+    day = value.astype("datetime64[D]")
+    return None if np.isnat(day) else day.item()
+
+
+def _read_cache_file(path: Path) -> _CachedCloses | None:
+    # Plain arrays only: allow_pickle=False means a tampered or foreign file can
+    # fail to load but never execute code.
+    try:
+        with np.load(path, allow_pickle=False) as stored:
+            dates = stored["dates"].astype("datetime64[D]")
+            closes = stored["closes"].astype(np.float64)
+            start, end = _from_day(stored["start"]), _from_day(stored["end"])
+            fetched_at = float(stored["fetched_at"])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+    if dates.ndim != 1 or dates.shape != closes.shape:
+        return None
+    return _CachedCloses(start=start, end=end, closes=(dates, closes), fetched_at=fetched_at)
+
+
+def _load_cached(symbol: str) -> _CachedCloses | None:
+    entry = _memory_cache.get(symbol)
+    if entry is None:
+        path = _cache_path(symbol)
+        entry = None if path is None else _read_cache_file(path)
+        if entry is None:
+            return None
+        _memory_cache[symbol] = entry
+
+    if not entry.is_fresh():
+        _memory_cache.pop(symbol, None)
+        return None
+    return entry
+
+
+def _store_cached(symbol: str, entry: _CachedCloses) -> None:
+    _memory_cache[symbol] = entry
+    path = _cache_path(symbol)
+    if path is None:
+        return
+    partial = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with partial.open("wb") as handle:
+            np.savez(
+                handle,
+                dates=entry.closes[0],
+                closes=entry.closes[1],
+                start=_to_day(entry.start),
+                end=_to_day(entry.end),
+                fetched_at=np.float64(entry.fetched_at),
+            )
+        os.replace(partial, path)
+    except OSError:
+        # The on-disk tier is best effort; the in-process copy still serves this session.
+        pass
+
+
+def _widen(current: date | None, candidate: date | None, pick: Any) -> date | None:
+    if current is None or candidate is None:
+        return None
+    return pick(current, candidate)
+
+
+def _download_closes(
+    symbols: Sequence[str],
+    *,
+    start: date | None,
+    end: date | None,
+) -> PriceHistory:
     try:
         import yfinance as yf  # type: ignore
     except ImportError as exc:  # pragma: no cover - exercised only when dependency missing at runtime
@@ -39,29 +153,107 @@ def fetch_daily_closes(
             "The 'yfinance' package is required to download market data. Install it with 'pip install yfinance'."
         ) from exc
 
+    # One batched request for every symbol; yfinance fans the downloads out over
+    # its own thread pool and returns a (ticker, field) column index.
+    data = yf.download(  # type: ignore[attr-defined]
+        list(symbols),
+        start=start,
+        end=end,
+        progress=False,
+        auto_adjust=True,
+        actions=False,
+        interval="1d",
+        group_by="ticker",
+        threads=True,
+    )
+
     history: PriceHistory = {}
-    for symbol in normalised:
-        data = yf.download(  # type: ignore[attr-defined]
-            symbol,
-            start=start,
-            end=end,
-            progress=False,
-            auto_adjust=True,
-            actions=False,
-            interval="1d",
+    grouped = data.columns.nlevels > 1
+    for symbol in symbols:
+        if data.empty or (grouped and symbol not in data.columns.get_level_values(0)):
+            continue
+        closes = (data[symbol] if grouped else data)["Close"].dropna()
+        if closes.empty:
+            continue
+        index = closes.index if closes.index.tz is None else closes.index.tz_localize(None)
+        history[symbol] = (
+            index.to_numpy(dtype="datetime64[D]"),
+            closes.to_numpy(dtype=np.float64),
         )
-        if data.empty:
+    return history
+
+
+def _slice_closes(closes: PriceSeries, start: date | None, end: date | None) -> PriceSeries:
+    # Mirror yfinance's bounds: ``start`` is inclusive, ``end`` is exclusive.
+    dates, values = closes
+    lower = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"))
+    upper = len(dates) if end is None else np.searchsorted(dates, np.datetime64(end, "D"))
+    return dates[lower:upper], values[lower:upper]
+
+
+def _fetch_closes(
+    tickers: Sequence[str],
+    *,
+    start: date | None,
+    end: date | None,
+) -> Tuple[PriceHistory, float]:
+    """Return the requested closes and the oldest ``fetched_at`` among the entries used."""
+
+    normalised = _normalise_tickers(tickers)
+    if not normalised:
+        raise ValueError("At least one ticker symbol must be provided.")
+
+    cached: Dict[str, _CachedCloses] = {}
+    missing: List[str] = []
+    fetch_start, fetch_end = start, end
+    for symbol in normalised:
+        entry = _load_cached(symbol)
+        if entry is not None and entry.covers(start, end):
+            cached[symbol] = entry
             continue
+        missing.append(symbol)
+        if entry is not None:
+            fetch_start = _widen(fetch_start, entry.start, min)
+            fetch_end = _widen(fetch_end, entry.end, max)
 
-        closes = []
-        for index, value in data["Close"].items():  # type: ignore[index]
-            closes.append((index.date(), float(value)))
-        if closes:
+    if missing:
+        downloaded = _download_closes(missing, start=fetch_start, end=fetch_end)
+        fetched_at = time.time()
+        for symbol, closes in downloaded.items():
+            entry = _CachedCloses(start=fetch_start, end=fetch_end, closes=closes, fetched_at=fetched_at)
+            _store_cached(symbol, entry)
+            cached[symbol] = entry
+
+    history: PriceHistory = {}
+    oldest = time.time()
+    for symbol in normalised:
+        if symbol not in cached:
+            continue
+        closes = _slice_closes(cached[symbol].closes, start, end)
+        if len(closes[0]):
             history[symbol] = closes
+            oldest = min(oldest, cached[symbol].fetched_at)
 
     if not history:
         raise ValueError("No price data was retrieved for the requested tickers.")
+    return history, oldest
+
+
+def fetch_daily_closes(
+    tickers: Sequence[str],
+    *,
+    start: date | None = None,
+    end: date | None = None,
+) -> PriceHistory:
+    """Download daily adjusted closing prices via the optional :mod:`yfinance` dependency.
+
+    Each symbol's history is cached in memory and on disk for up to
+    :data:`CACHE_MAX_AGE_SECONDS`. Requests that fall inside a cached range are served
+    by slicing it; otherwise the download is widened to cover both ranges.
+    """
+
+    history, _ = _fetch_closes(tickers, start=start, end=end)
     return history
 
 
-__all__ = ["fetch_daily_closes", "PriceHistory", "PricePoint"]
+__all__ = ["fetch_daily_closes", "PriceHistory", "PriceSeries"]
@@ -0,0 +1,62 @@
+"""Cached download-and-correlate pipeline used by the user interface."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+from typing import Optional, Sequence, Tuple
+
+from .analysis import CorrelationResult, compute_correlation_matrix
+from .data import CACHE_MAX_AGE_SECONDS, _fetch_closes, _normalise_tickers
+
+RESULT_CACHE_SIZE = 32
+
+_ResultKey = Tuple[Tuple[str, ...], Optional[date], Optional[date], str]
+
+# Least recently used first. Each entry is stamped with the fetch time of the
+# oldest prices it was built from, so it expires no later than those prices do.
+_results: "OrderedDict[_ResultKey, Tuple[float, CorrelationResult]]" = OrderedDict()
+_results_lock = Lock()
+
+
+class PriceDownloadError(Exception):
+    """Raised when the prices for a correlation request could not be retrieved."""
+
+
+def correlate_tickers(
+    tickers: Sequence[str],
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    return_type: str = "log",
+) -> CorrelationResult:
+    """Download closes and compute their correlation matrix, reusing recent results.
+
+    Any failure while retrieving prices is raised as :class:`PriceDownloadError`;
+    analysis failures propagate unchanged (``ValueError`` for unusable data).
+    """
+
+    key: _ResultKey = (tuple(sorted(_normalise_tickers(tickers))), start, end, return_type)
+    with _results_lock:
+        cached = _results.get(key)
+        if cached is not None and time.time() - cached[0] < CACHE_MAX_AGE_SECONDS:
+            _results.move_to_end(key)
+            return cached[1]
+
+    try:
+        price_history, fetched_at = _fetch_closes(key[0], start=start, end=end)
+    except Exception as exc:
+        raise PriceDownloadError(str(exc)) from exc
+    result = compute_correlation_matrix(price_history, return_type=return_type)
+
+    with _results_lock:
+        _results[key] = (fetched_at, result)
+        _results.move_to_end(key)
+        while len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+    return result
+
+
+__all__ = ["PriceDownloadError", "correlate_tickers"]
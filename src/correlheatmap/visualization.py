@@ -4,26 +4,59 @@ from __future__ import annotations
 
 from typing import Tuple
 
+import numpy as np
+
+RGB = Tuple[int, int, int]
+
 NEGATIVE_COLOUR = (33, 102, 172)  # Deep blue
 NEUTRAL_COLOUR = (247, 247, 247)  # Light grey
 POSITIVE_COLOUR = (178, 24, 43)   # Deep red
 
 
-def _interpolate_colour(start: Tuple[int, int, int], end: Tuple[int, int, int], fraction: float) -> str:
+# Per-channel spans of the two gradient halves, worked out once at import.
+_NEGATIVE_DELTA = tuple(end - start for start, end in zip(NEGATIVE_COLOUR, NEUTRAL_COLOUR))
+_POSITIVE_DELTA = tuple(end - start for start, end in zip(NEUTRAL_COLOUR, POSITIVE_COLOUR))
+
+
+def _interpolate_colour(start: RGB, delta: Tuple[int, ...], fraction: float) -> RGB:
     fraction = max(0.0, min(1.0, fraction))
-    red = int(start[0] + (end[0] - start[0]) * fraction + 0.5)
-    green = int(start[1] + (end[1] - start[1]) * fraction + 0.5)
-    blue = int(start[2] + (end[2] - start[2]) * fraction + 0.5)
-    return f"#{red:02x}{green:02x}{blue:02x}"
+    red = int(start[0] + delta[0] * fraction + 0.5)
+    green = int(start[1] + delta[1] * fraction + 0.5)
+    blue = int(start[2] + delta[2] * fraction + 0.5)
+    return red, green, blue
+
+
+def _compute_rgb(value: float) -> RGB:
+    if value >= 0:
+        return _interpolate_colour(NEUTRAL_COLOUR, _POSITIVE_DELTA, value)
+    return _interpolate_colour(NEGATIVE_COLOUR, _NEGATIVE_DELTA, 1.0 + value)
+
+
+# Correlations are displayed to two decimals, so the colour map only ever needs
+# the 201 steps from -1.00 to 1.00.
+LUT_STEPS = 100
+_RGB_LUT = np.array(
+    [_compute_rgb(-1.0 + index / LUT_STEPS) for index in range(2 * LUT_STEPS + 1)], dtype=np.uint8
+)
+_HEX_LUT = [f"#{red:02x}{green:02x}{blue:02x}" for red, green, blue in _RGB_LUT.tolist()]
 
 
 def correlation_to_hex(value: float) -> str:
     """Map a correlation value in [-1, 1] to a colour hex code."""
 
+    if value != value:  # NaN: an undefined correlation gets the neutral colour.
+        return _HEX_LUT[LUT_STEPS]
     clamped = max(-1.0, min(1.0, value))
-    if clamped >= 0:
-        return _interpolate_colour(NEUTRAL_COLOUR, POSITIVE_COLOUR, clamped)
-    return _interpolate_colour(NEGATIVE_COLOUR, NEUTRAL_COLOUR, 1.0 + clamped)
+    return _HEX_LUT[int(round((clamped + 1.0) * LUT_STEPS))]
+
+
+def correlations_to_rgb(values: np.ndarray) -> np.ndarray:
+    """Map an array of correlations to a ``uint8`` RGB array with a trailing axis of 3."""
+
+    # NaN would cast to a garbage index; treat it as zero, the neutral colour.
+    cleaned = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0, posinf=1.0, neginf=-1.0)
+    clamped = np.clip(cleaned, -1.0, 1.0)
+    return _RGB_LUT[np.rint((clamped + 1.0) * LUT_STEPS).astype(np.intp)]
 
 
-__all__ = ["correlation_to_hex"]
+__all__ = ["correlation_to_hex", "correlations_to_rgb"]
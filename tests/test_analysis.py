@@ -1,29 +1,31 @@
 from __future__ import annotations
 
-from datetime import date, timedelta
+from datetime import date
 
+import numpy as np
 import pytest
 
 from correlheatmap.analysis import CorrelationResult, compute_correlation_matrix, compute_returns
-from correlheatmap.data import PriceHistory
+from correlheatmap.data import PriceHistory, PriceSeries
 
 
-def make_price_series(start: date, prices: list[float]) -> list[tuple[date, float]]:
-    return [(start + timedelta(days=i), price) for i, price in enumerate(prices)]
+def make_price_series(start: date, prices: list[float]) -> PriceSeries:
+    first = np.datetime64(start, "D")
+    return first + np.arange(len(prices)), np.asarray(prices, dtype=np.float64)
 
 
 def test_compute_returns_log() -> None:
     series = make_price_series(date(2024, 1, 1), [100.0, 110.0, 121.0])
-    returns = compute_returns(series, return_type="log")
-    assert len(returns) == 2
-    assert pytest.approx(returns[0][1], rel=1e-9) == 0.0953101798
-    assert pytest.approx(returns[1][1], rel=1e-9) == 0.0953101798
+    dates, returns = compute_returns(series, return_type="log")
+    assert list(dates) == [np.datetime64("2024-01-02"), np.datetime64("2024-01-03")]
+    assert pytest.approx(returns[0], rel=1e-9) == 0.0953101798
+    assert pytest.approx(returns[1], rel=1e-9) == 0.0953101798
 
 
 def test_compute_returns_pct() -> None:
     series = make_price_series(date(2024, 1, 1), [50.0, 55.0, 60.5])
-    returns = compute_returns(series, return_type="pct")
-    assert [round(value, 4) for _, value in returns] == [0.1, 0.1]
+    _, returns = compute_returns(series, return_type="pct")
+    assert [round(value, 4) for value in returns] == [0.1, 0.1]
 
 
 def test_compute_correlation_matrix_basic() -> None:
@@ -34,7 +36,7 @@ def test_compute_correlation_matrix_basic() -> None:
     }
     result = compute_correlation_matrix(history, return_type="pct")
     assert isinstance(result, CorrelationResult)
-    assert result.tickers == ["AAA", "BBB", "CCC"]
+    assert result.tickers == ("AAA", "BBB", "CCC")
     assert result.observation_count == 4
     assert result.matrix[0][0] == pytest.approx(1.0)
     assert result.matrix[1][1] == pytest.approx(1.0)
@@ -52,3 +54,104 @@ def test_compute_returns_requires_positive_prices() -> None:
     series = make_price_series(date(2024, 1, 1), [100.0, 0.0, 120.0])
     with pytest.raises(ValueError):
         compute_returns(series)
+
+
+def test_compute_correlation_matrix_matches_numpy() -> None:
+    history: PriceHistory = {
+        "AAA": make_price_series(date(2024, 1, 1), [100, 102, 104, 103, 105, 107]),
+        "BBB": make_price_series(date(2024, 1, 1), [50, 49, 52, 51, 53, 52]),
+        "CCC": make_price_series(date(2024, 1, 1), [200, 198, 202, 205, 207, 204]),
+    }
+    result = compute_correlation_matrix(history, return_type="log")
+    returns = np.array([compute_returns(history[t])[1] for t in result.tickers])
+    assert np.allclose(result.matrix, np.corrcoef(returns))
+
+
+def test_compute_correlation_matrix_constant_series() -> None:
+    history: PriceHistory = {
+        "AAA": make_price_series(date(2024, 1, 1), [100, 100, 100, 100]),
+        "BBB": make_price_series(date(2024, 1, 1), [50, 51, 52, 51]),
+    }
+    result = compute_correlation_matrix(history, return_type="pct")
+    assert result.matrix == ((1.0, 0.0), (0.0, 1.0))
+
+
+def test_compute_correlation_matrix_aligns_on_common_dates() -> None:
+    history: PriceHistory = {
+        "AAA": make_price_series(date(2024, 1, 1), [100, 102, 104, 103, 105, 106]),
+        "BBB": make_price_series(date(2024, 1, 3), [52, 51, 53, 55]),
+    }
+    result = compute_correlation_matrix(history, return_type="pct")
+    assert result.observation_count == 3
+
+
+def test_numba_cross_product_matches_blas() -> None:
+    pytest.importorskip("numba")
+    from correlheatmap.analysis_numba import _cross_product_kernel
+
+    centred = np.random.default_rng(0).standard_normal((250, 7))
+    centred -= centred.mean(axis=0)
+    assert np.allclose(_cross_product_kernel(np.ascontiguousarray(centred.T)), centred.T @ centred)
+
+
+def test_numba_cross_product_used_only_for_wide_matrices(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numba")
+    from correlheatmap import analysis_numba
+
+    calls: list[tuple[int, ...]] = []
+
+    def fake_kernel(columns: np.ndarray) -> np.ndarray:
+        calls.append(columns.shape)
+        return columns @ columns.T
+
+    monkeypatch.setattr(analysis_numba, "_cross_product_kernel", fake_kernel)
+    monkeypatch.setattr(analysis_numba, "get_num_threads", lambda: 4)
+    monkeypatch.setattr(analysis_numba, "NUMBA_MIN_TICKERS", 5)
+
+    rng = np.random.default_rng(1)
+    narrow, wide = rng.standard_normal((50, 4)), rng.standard_normal((50, 5))
+    assert np.allclose(analysis_numba.cross_product(narrow), narrow.T @ narrow)
+    assert np.allclose(analysis_numba.cross_product(wide), wide.T @ wide)
+    assert calls == [(5, 50)]
+
+
+def test_compute_returns_sorts_unordered_series() -> None:
+    dates, prices = make_price_series(date(2024, 1, 1), [100.0, 110.0, 121.0])
+    expected_dates, expected = compute_returns((dates, prices))
+    shuffled_dates, shuffled = compute_returns((dates[::-1], prices[::-1]))
+    assert np.array_equal(shuffled_dates, expected_dates)
+    assert np.allclose(shuffled, expected)
+
+
+@pytest.mark.parametrize("return_type", ["log", "pct"])
+def test_compute_returns_numexpr_matches_numpy(monkeypatch: pytest.MonkeyPatch, return_type: str) -> None:
+    pytest.importorskip("numexpr")
+    from correlheatmap import analysis
+
+    series = make_price_series(date(2024, 1, 1), [100.0, 101.5, 99.0, 102.25, 103.0])
+    _, expected = compute_returns(series, return_type=return_type)
+    monkeypatch.setattr(analysis, "NUMEXPR_MIN_OBSERVATIONS", 0)
+    _, accelerated = compute_returns(series, return_type=return_type)
+    assert np.allclose(accelerated, expected)
+
+
+def test_compute_returns_keeps_last_close_for_duplicate_dates() -> None:
+    dates = np.array(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"], dtype="datetime64[D]")
+    prices = np.array([100.0, 105.0, 110.0, 121.0])
+    return_dates, returns = compute_returns((dates, prices), return_type="pct")
+    assert return_dates.astype(str).tolist() == ["2024-01-02", "2024-01-03"]
+    assert returns == pytest.approx([0.1, 0.1])
+
+
+def test_compute_correlation_matrix_threaded_matches_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    from correlheatmap import analysis
+
+    history: PriceHistory = {
+        "AAA": make_price_series(date(2024, 1, 1), [100, 102, 104, 103, 105, 107]),
+        "BBB": make_price_series(date(2024, 1, 1), [50, 49, 52, 51, 53, 52]),
+        "CCC": make_price_series(date(2024, 1, 1), [200, 198, 202, 205, 207, 204]),
+    }
+    serial = compute_correlation_matrix(history)
+    monkeypatch.setattr(analysis, "THREADED_MIN_OBSERVATIONS", 0)
+    monkeypatch.setattr(analysis.os, "cpu_count", lambda: 4)
+    assert compute_correlation_matrix(history) == serial
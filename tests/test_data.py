@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import sys
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlheatmap import data
+
+
+def make_frame(symbols: list[str], closes: dict[str, list[float]], *, tz: str | None = None) -> pd.DataFrame:
+    index = pd.date_range("2024-01-02", periods=3, freq="D", tz=tz)
+    columns = pd.MultiIndex.from_product([symbols, ["Open", "Close"]])
+    frame = pd.DataFrame(np.nan, index=index, columns=columns)
+    for symbol, values in closes.items():
+        frame[(symbol, "Close")] = values
+    return frame
+
+
+@pytest.fixture
+def stub_yfinance(monkeypatch: pytest.MonkeyPatch):
+    def install(frame: pd.DataFrame) -> list[list[str]]:
+        calls: list[list[str]] = []
+
+        def download(symbols, **kwargs):
+            calls.append(list(symbols))
+            return frame
+
+        monkeypatch.setitem(sys.modules, "yfinance", SimpleNamespace(download=download))
+        return calls
+
+    return install
+
+
+def test_download_closes_splits_grouped_columns(stub_yfinance) -> None:
+    frame = make_frame(["AAA", "BBB"], {"AAA": [1.0, 2.0, 3.0], "BBB": [4.0, np.nan, 6.0]})
+    calls = stub_yfinance(frame)
+
+    history = data._download_closes(["AAA", "BBB"], start=None, end=None)
+
+    assert calls == [["AAA", "BBB"]]
+    dates, closes = history["AAA"]
+    assert dates.dtype == np.dtype("datetime64[D]")
+    assert closes.tolist() == [1.0, 2.0, 3.0]
+    assert history["BBB"][0].astype(str).tolist() == ["2024-01-02", "2024-01-04"]
+    assert history["BBB"][1].tolist() == [4.0, 6.0]
+
+
+def test_download_closes_skips_missing_and_empty_symbols(stub_yfinance) -> None:
+    frame = make_frame(["AAA", "BBB"], {"AAA": [1.0, 2.0, 3.0]})
+    stub_yfinance(frame)
+
+    history = data._download_closes(["AAA", "BBB", "CCC"], start=None, end=None)
+
+    assert list(history) == ["AAA"]
+
+
+def test_download_closes_handles_flat_columns(stub_yfinance) -> None:
+    frame = make_frame(["AAA"], {"AAA": [1.0, 2.0, 3.0]})["AAA"]
+    stub_yfinance(frame)
+
+    history = data._download_closes(["AAA"], start=None, end=None)
+
+    assert history["AAA"][1].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_download_closes_keeps_local_dates_for_tz_aware_index(stub_yfinance) -> None:
+    frame = make_frame(["AAA"], {"AAA": [1.0, 2.0, 3.0]}, tz="Asia/Tokyo")
+    stub_yfinance(frame)
+
+    dates, _ = data._download_closes(["AAA"], start=None, end=None)["AAA"]
+
+    assert str(dates[0]) == "2024-01-02"
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setattr(data, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(data, "_memory_cache", {})
+    downloads: list[tuple[list[str], date | None, date | None]] = []
+
+    def fake_download(symbols, *, start, end):
+        downloads.append((list(symbols), start, end))
+        dates = np.arange(np.datetime64(start or "2023-01-01"), np.datetime64(end or "2025-01-01"))
+        return {symbol: (dates, np.arange(1.0, len(dates) + 1.0)) for symbol in symbols}
+
+    monkeypatch.setattr(data, "_download_closes", fake_download)
+    return downloads
+
+
+def test_fetch_serves_narrower_range_from_cache(cache) -> None:
+    data.fetch_daily_closes(["aaa"], start=date(2024, 1, 1), end=date(2024, 2, 1))
+    dates, _ = data.fetch_daily_closes(["AAA"], start=date(2024, 1, 10), end=date(2024, 1, 20))["AAA"]
+
+    assert len(cache) == 1
+    assert str(dates[0]) == "2024-01-10"
+    assert str(dates[-1]) == "2024-01-19"
+
+
+def test_fetch_widens_download_for_uncovered_range(cache) -> None:
+    data.fetch_daily_closes(["AAA"], start=date(2024, 1, 1), end=date(2024, 2, 1))
+    data.fetch_daily_closes(["AAA", "BBB"], start=date(2023, 12, 1), end=date(2024, 1, 15))
+
+    assert cache[-1] == (["AAA", "BBB"], date(2023, 12, 1), date(2024, 2, 1))
+    assert data._memory_cache["AAA"].covers(date(2023, 12, 1), date(2024, 2, 1))
+
+
+def test_fetch_refetches_expired_entries(cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    data.fetch_daily_closes(["AAA"], start=date(2024, 1, 1), end=date(2024, 2, 1))
+    later = time.time() + data.CACHE_MAX_AGE_SECONDS + 1
+    monkeypatch.setattr(data.time, "time", lambda: later)
+    data.fetch_daily_closes(["AAA"], start=date(2024, 1, 1), end=date(2024, 2, 1))
+
+    assert len(cache) == 2
+
+
+def test_fetch_reloads_cache_from_disk(cache, tmp_path) -> None:
+    first = data.fetch_daily_closes(["AAA"], start=date(2024, 1, 1), end=date(2024, 2, 1))["AAA"]
+    data._memory_cache.clear()
+    second = data.fetch_daily_closes(["AAA"], start=date(2024, 1, 1), end=date(2024, 2, 1))["AAA"]
+
+    assert len(cache) == 1
+    assert [path.name for path in tmp_path.iterdir()] == ["AAA.v2.npz"]
+    assert np.array_equal(first[0], second[0])
+    assert np.array_equal(first[1], second[1])
+
+
+def test_unreadable_cache_file_is_ignored(cache, tmp_path) -> None:
+    (tmp_path / "AAA.v2.npz").write_bytes(b"not an archive")
+    data.fetch_daily_closes(["AAA"], start=date(2024, 1, 1), end=date(2024, 2, 1))
+
+    assert len(cache) == 1
+
+
+def test_fetch_reports_oldest_price_timestamp(cache, monkeypatch: pytest.MonkeyPatch) -> None:
+    data.fetch_daily_closes(["AAA"], start=date(2024, 1, 1), end=date(2024, 2, 1))
+    first_fetch = data._memory_cache["AAA"].fetched_at
+    monkeypatch.setattr(data.time, "time", lambda: first_fetch + 60)
+    _, oldest = data._fetch_closes(["AAA", "BBB"], start=date(2024, 1, 1), end=date(2024, 2, 1))
+
+    assert oldest == first_fetch
+
+
+@pytest.mark.parametrize("symbol", ["../../X", "A/B", "A\\B"])
+def test_unsafe_symbols_are_not_written_to_disk(
+    cache, tmp_path, monkeypatch: pytest.MonkeyPatch, symbol: str
+) -> None:
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(data, "CACHE_DIR", cache_dir)
+    history = data.fetch_daily_closes([symbol], start=date(2024, 1, 1), end=date(2024, 2, 1))
+    data.fetch_daily_closes([symbol], start=date(2024, 1, 1), end=date(2024, 2, 1))
+
+    assert list(history) == [symbol]
+    assert len(cache) == 1
+    assert not cache_dir.exists()
+    assert [path.name for path in tmp_path.iterdir()] == []
+    assert not (tmp_path.parent / "X.v2.npz").exists()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from datetime import date
+
+import numpy as np
+import pytest
+
+from correlheatmap import pipeline
+from correlheatmap.data import PriceHistory
+
+START, END = date(2024, 1, 1), date(2024, 2, 1)
+
+
+class FakeFetch:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, ...]] = []
+        self.fetched_at: float | None = None
+
+    def __call__(self, tickers, *, start=None, end=None) -> tuple[PriceHistory, float]:
+        self.calls.append(tuple(tickers))
+        dates = np.datetime64("2024-01-01") + np.arange(4)
+        history: PriceHistory = {
+            "AAA": (dates, np.array([100.0, 102.0, 101.0, 104.0])),
+            "BBB": (dates, np.array([50.0, 50.5, 51.5, 51.0])),
+        }
+        return history, time.time() if self.fetched_at is None else self.fetched_at
+
+
+@pytest.fixture
+def fetch(monkeypatch: pytest.MonkeyPatch) -> FakeFetch:
+    fake = FakeFetch()
+    monkeypatch.setattr(pipeline, "_fetch_closes", fake)
+    monkeypatch.setattr(pipeline, "_results", type(pipeline._results)())
+    return fake
+
+
+def test_correlate_tickers_reuses_identical_requests(fetch: FakeFetch) -> None:
+    first = pipeline.correlate_tickers(["BBB", "AAA"], start=START, end=END)
+    second = pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END)
+    pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END, return_type="pct")
+
+    assert first is second
+    assert fetch.calls == [("AAA", "BBB"), ("AAA", "BBB")]
+
+
+def test_correlate_tickers_normalises_cache_key(fetch: FakeFetch) -> None:
+    first = pipeline.correlate_tickers(["aapl", "msft"], start=START, end=END)
+    second = pipeline.correlate_tickers([" MSFT", "AAPL", "msft"], start=START, end=END)
+
+    assert first is second
+    assert fetch.calls == [("AAPL", "MSFT")]
+
+
+def test_correlate_tickers_expires_results(fetch: FakeFetch, monkeypatch: pytest.MonkeyPatch) -> None:
+    pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END)
+    later = time.time() + pipeline.CACHE_MAX_AGE_SECONDS + 1
+    monkeypatch.setattr(pipeline.time, "time", lambda: later)
+    pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END)
+
+    assert len(fetch.calls) == 2
+
+
+def test_correlate_tickers_expires_with_oldest_prices(fetch: FakeFetch) -> None:
+    fetch.fetched_at = time.time() - pipeline.CACHE_MAX_AGE_SECONDS - 1
+    pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END)
+    pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END)
+
+    assert len(fetch.calls) == 2
+
+
+def test_correlate_tickers_wraps_fetch_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    def failing_fetch(tickers, *, start=None, end=None) -> tuple[PriceHistory, float]:
+        raise ValueError("No price data was retrieved for the requested tickers.")
+
+    monkeypatch.setattr(pipeline, "_fetch_closes", failing_fetch)
+    monkeypatch.setattr(pipeline, "_results", type(pipeline._results)())
+
+    with pytest.raises(pipeline.PriceDownloadError, match="No price data"):
+        pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END)
+
+
+def test_correlate_tickers_propagates_analysis_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    def single_ticker_fetch(tickers, *, start=None, end=None) -> tuple[PriceHistory, float]:
+        dates = np.datetime64("2024-01-01") + np.arange(3)
+        return {"AAA": (dates, np.array([1.0, 2.0, 3.0]))}, time.time()
+
+    monkeypatch.setattr(pipeline, "_fetch_closes", single_ticker_fetch)
+    monkeypatch.setattr(pipeline, "_results", type(pipeline._results)())
+
+    with pytest.raises(ValueError) as excinfo:
+        pipeline.correlate_tickers(["AAA", "BBB"], start=START, end=END)
+    assert not isinstance(excinfo.value, pipeline.PriceDownloadError)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from correlheatmap.visualization import correlation_to_hex
+import numpy as np
+
+from correlheatmap.visualization import correlation_to_hex, correlations_to_rgb
 
 
 def test_correlation_to_hex_range() -> None:
@@ -12,3 +14,22 @@ def test_correlation_to_hex_range() -> None:
 def test_correlation_to_hex_clamps_values() -> None:
     assert correlation_to_hex(-2.0) == "#2166ac"
     assert correlation_to_hex(2.0) == "#b2182b"
+
+
+def test_correlation_to_hex_rounds_to_display_precision() -> None:
+    assert correlation_to_hex(0.501) == correlation_to_hex(0.5)
+    assert correlation_to_hex(-0.249) == correlation_to_hex(-0.25)
+
+
+def test_correlations_to_rgb_matches_hex() -> None:
+    matrix = np.array([[1.0, -0.37], [0.5, -2.0]])
+    rgb = correlations_to_rgb(matrix)
+    assert rgb.shape == (2, 2, 3)
+    for value, pixel in zip(matrix.ravel(), rgb.reshape(-1, 3)):
+        assert correlation_to_hex(value) == "#{:02x}{:02x}{:02x}".format(*pixel)
+
+
+def test_undefined_correlations_use_neutral_colour() -> None:
+    rgb = correlations_to_rgb(np.array([[1.0, np.nan], [np.nan, 1.0]]))
+    assert "#{:02x}{:02x}{:02x}".format(*rgb[0, 1]) == "#f7f7f7"
+    assert correlation_to_hex(float("nan")) == "#f7f7f7"